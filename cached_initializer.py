@@ -0,0 +1,73 @@
+# app/core/registry/cached_initializer.py
+
+"""
+Per-event-loop cache around initialize_agents().
+
+Every agent lookup on a loop shares one set of components; the first caller builds
+them under a lock and later callers get the cached tuple. The components hold
+loop-bound clients, so a call from a different loop (e.g. a second asyncio.run()
+in the same process) closes the cached set and initializes a fresh one. Callers
+own shutdown: call close_components() before the loop exits.
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional, Tuple
+
+from app.core.agents.constants import AgentType
+from app.core.registry.agent_initializer import initialize_agents
+
+logger = logging.getLogger(__name__)
+
+# Tuple returned by initialize_agents(); the agent registry is at index 2
+Components = Tuple[Any, ...]
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_components: Optional[Components] = None
+_lock: Optional[asyncio.Lock] = None
+
+
+async def _close_agents(components: Components) -> None:
+    """Close every registered agent, logging rather than raising close failures."""
+    agent_registry = components[2]
+    closed = set()
+    for agent_type in AgentType:
+        agent = agent_registry.get_agent(agent_type.value)
+        if not agent or id(agent) in closed or not hasattr(agent, "close"):
+            continue
+        closed.add(id(agent))
+        try:
+            await agent.close()
+        except Exception as err:
+            logger.warning("Failed to close %s agent: %s", agent_type.value, err)
+
+
+async def get_components() -> Components:
+    """Return the running loop's shared agent components, initializing them on first use."""
+    global _loop, _components, _lock
+    loop = asyncio.get_running_loop()
+    if _loop is not loop:
+        stale = _components
+        _loop, _components, _lock = loop, None, asyncio.Lock()
+        if stale is not None:
+            await _close_agents(stale)
+    if _components is None:
+        async with _lock:
+            if _components is None:
+                _components = await initialize_agents()
+    return _components
+
+
+async def close_components() -> None:
+    """Close the cached agents' clients; the next get_components() call builds a fresh set."""
+    global _components
+    components, _components = _components, None
+    if components is not None:
+        await _close_agents(components)
+
+
+async def reset_components() -> None:
+    """Close and drop the cached components so the next call initializes a fresh set."""
+    global _loop, _lock
+    await close_components()
+    _loop = _lock = None
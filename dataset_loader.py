@@ -0,0 +1,103 @@
+# demo/dataset_loader.py
+
+"""
+Dataset loading shared by the demo scripts.
+
+The first load of a spreadsheet, after dropping mostly-empty columns, is written
+to a Parquet file under a sibling .cache/ directory, tagged with the workbook's
+mtime and size and the Excel engine that parsed it; later runs read that cache
+instead of re-parsing and re-filtering the workbook, as long as the tag still
+matches. The tag is checked from the file's schema metadata before any data is
+read, and the cache is replaced atomically.
+"""
+
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.core.excel_engine import EXCEL_ENGINE
+
+logger = logging.getLogger(__name__)
+
+# Columns need at least this share of non-null values to be kept
+NON_NULL_RATIO = 0.2
+
+# Parquet schema metadata key holding the "<mtime_ns>:<size>:<engine>" the cache was built from
+SOURCE_KEY_FIELD = b"source_key"
+
+
+def _cache_path(spreadsheet_path: Path) -> Path:
+    """Return the cache file for a spreadsheet, keyed on NON_NULL_RATIO."""
+    ratio_key = f"p{round(NON_NULL_RATIO * 100)}"
+    return spreadsheet_path.parent / ".cache" / f"{spreadsheet_path.stem}.{ratio_key}.parquet"
+
+
+def _read_cache(cache_path: Path, source_key: bytes) -> pd.DataFrame | None:
+    """Return the cached dataset if it was built from source_key, else None."""
+    try:
+        # Check the tag in the footer before reading any column data
+        metadata = pq.read_schema(cache_path).metadata or {}
+        if metadata.get(SOURCE_KEY_FIELD) != source_key:
+            return None
+        return pq.read_table(cache_path).to_pandas(types_mapper=pd.ArrowDtype)
+    except (OSError, pa.ArrowException) as err:
+        # Missing, truncated or otherwise unreadable caches are rebuilt
+        if not isinstance(err, FileNotFoundError):
+            logger.debug("Ignoring unreadable dataset cache %s: %s", cache_path, err)
+        return None
+
+
+def _write_cache(cache_path: Path, dataset: pd.DataFrame, source_key: bytes) -> None:
+    """Write the dataset tagged with source_key, replacing any old cache atomically."""
+    table = pa.Table.from_pandas(dataset)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), SOURCE_KEY_FIELD: source_key})
+    cache_path.parent.mkdir(exist_ok=True)
+    # Write next to the target and rename, so an interrupted write never leaves a truncated cache
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def load_dataset(spreadsheet_path: Path) -> pd.DataFrame:
+    """Load a spreadsheet with mostly-empty columns dropped, using a Parquet cache."""
+    try:
+        stat = os.stat(spreadsheet_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Spreadsheet not found at {spreadsheet_path}") from None
+
+    # The cache is valid only for the exact spreadsheet, and Excel engine, it was built from
+    source_key = f"{stat.st_mtime_ns}:{stat.st_size}:{EXCEL_ENGINE}".encode()
+    cache_path = _cache_path(spreadsheet_path)
+    cached = _read_cache(cache_path, source_key)
+    if cached is not None:
+        logger.debug("Loaded cached dataset from %s", cache_path)
+        return cached
+
+    dataset = pd.read_excel(spreadsheet_path, engine=EXCEL_ENGINE, dtype_backend="pyarrow")
+
+    # Parquet requires string column names (date headers come back as datetimes)
+    dataset.columns = dataset.columns.astype(str)
+
+    # Drop columns with at least 80% null values
+    threshold = int(NON_NULL_RATIO * len(dataset))
+    non_null_counts = dataset.notna().sum(axis=0).to_numpy()
+    keep = non_null_counts >= threshold
+    logger.debug("Dropping %d of %d mostly-empty columns", int((~keep).sum()), len(keep))
+    dataset = dataset.loc[:, keep]
+
+    # The cache is only an optimization; a failed write must not lose the loaded dataset
+    try:
+        _write_cache(cache_path, dataset, source_key)
+    except (OSError, pa.ArrowException) as err:
+        logger.warning("Could not cache dataset at %s: %s", cache_path, err)
+    else:
+        logger.debug("Cached dataset at %s", cache_path)
+    return dataset
@@ -0,0 +1,54 @@
+# app/core/date_formats.py
+
+"""
+Known date formats and a memoized matcher for date-like column headers.
+
+Shared by the spreadsheet agent's date detection and the financial prompt's date
+range, so both recognise the same headers.
+"""
+
+import functools
+import re
+from typing import Optional
+
+import pandas as pd
+
+# Date formats tried, in order, against column names and sampled column values
+KNOWN_DATE_FORMATS = (
+    "%d/%m/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%B %Y", "%b-%y",
+    "%m/%Y", "%Y%m", "%d-%m-%Y", "%m-%d-%Y", "%b-%Y",
+    "%Y-%b", "%b/%y", "%b/%Y"
+)
+
+# Loose regex equivalents of the strptime directives used in KNOWN_DATE_FORMATS
+_DIRECTIVE_PATTERNS = {
+    "%d": r"\d+", "%m": r"\d+", "%Y": r"\d+", "%y": r"\d+",
+    "%H": r"\d+", "%M": r"\d+", "%S": r"\d+",
+    "%B": r"[^\W\d_]+", "%b": r"[^\W\d_]+",
+}
+
+
+def _format_pattern(fmt: str) -> str:
+    """Translate a strptime format into a regex accepting a superset of its matches."""
+    parts = re.split(r"(%[A-Za-z]|\s+)", fmt)
+    # strptime treats whitespace in the format as one or more whitespace characters
+    return "".join(
+        r"\s+" if part.isspace() else _DIRECTIVE_PATTERNS.get(part, re.escape(part))
+        for part in parts
+    )
+
+
+_FORMAT_PATTERNS = tuple((fmt, re.compile(_format_pattern(fmt))) for fmt in KNOWN_DATE_FORMATS)
+_HEADER_DATE_RE = re.compile("|".join(f"(?:{pattern.pattern})" for _, pattern in _FORMAT_PATTERNS))
+
+
+@functools.lru_cache(maxsize=4096)
+def match_header_format(name: str) -> Optional[str]:
+    """Return the first known date format that parses a column name, if any."""
+    # Most headers are plain labels; reject them with one regex match before calling pandas
+    if not _HEADER_DATE_RE.fullmatch(name):
+        return None
+    for fmt, pattern in _FORMAT_PATTERNS:
+        if pattern.fullmatch(name) and pd.notna(pd.to_datetime(name, format=fmt, errors='coerce')):
+            return fmt
+    return None
@@ -0,0 +1,8 @@
+# app/core/excel_engine.py
+
+"""Excel reader engine shared by the spreadsheet agent and the demo dataset loader."""
+
+import importlib.util
+
+# Rust-based calamine parses xlsx much faster than openpyxl; use it when installed
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
@@ -1,40 +1,99 @@
-from typing import Any, Dict
+from typing import List
+import orjson
 import pandas as pd
+from app.agents.schemas.financial_data_agent_schemas import FINANCIAL_RESPONSE_EXAMPLES
+from app.core.date_formats import match_header_format
 from app.core.mission.schemas.planner import Task
 
-SYSTEM_PROMPT = """You are an AI financial analyst. Your role is to analyze financial data and provide clear, structured responses.
+_INSTRUCTIONS = """You are an AI financial analyst. Your role is to analyze financial data and provide clear, structured responses.
 
 **Instructions:**
 1. Determine 'query_type' (metric_lookup, comparison, trend_analysis, summary, etc.) based on the query.
-2. Structure 'result' according to query_type:
-   metric_lookup:
-     { "metric": "<string>", "value": <number>, "date": "YYYY-MM-DD" }
-   comparison:
-     { "comparison": { ... }, "period": "<string>", "difference": <number> }
-   trend_analysis:
-     { "trend": { ... }, "period": "<string>", "insights": "<string>" }
-   summary:
-     { "key_metrics": { ... }, "period": "<string>", "highlights": [<strings>], "areas_of_concern": [<strings>] }
-
+2. Structure 'result' according to query_type, as in these examples:
+{examples}
 3. Always include:
    - query_type: e.g., "metric_lookup"
    - result: matching the chosen query_type's structure
    - analysis: a detailed explanation
-
-5. If data isn't fully visible, state assumptions or partial availability logically.
-6. Return JSON with query_type, result, analysis. No extra fields.
+4. If data isn't fully visible, state assumptions or partial availability logically.
+5. Return JSON with query_type, result, analysis. No extra fields.
 
 Follow these instructions strictly.
 """
 
+
+def _compact(text: str) -> str:
+    """Collapse whitespace runs within each line and drop blank lines."""
+    return "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+
+# Minified, one per line, from the response schema so prompt and schema cannot drift
+EXAMPLES_BLOCK = "\n".join(
+    orjson.dumps(example).decode()
+    for example in FINANCIAL_RESPONSE_EXAMPLES
+)
+
+SYSTEM_PROMPT = _compact(_INSTRUCTIONS).format(examples=EXAMPLES_BLOCK)
+
+# Bounds for the table preview that accompanies the dataset summary
+PREVIEW_ROWS = 20  # rows taken from each of the head and the tail
+PREVIEW_COLS = 20
+PREVIEW_COLWIDTH = 40
+
+
+def _date_range(dataset: pd.DataFrame) -> List[str] | None:
+    """Return the earliest and latest dates found in datetime columns or date-like headers."""
+    dates = []
+    for col in dataset.columns.astype(str):
+        # Same known formats the spreadsheet agent uses to detect date headers
+        fmt = match_header_format(col)
+        if fmt:
+            dates.append(pd.to_datetime(col, format=fmt))
+    for col, dtype in dataset.dtypes.items():
+        if dtype.kind == "M":
+            dates.extend([dataset[col].min(), dataset[col].max()])
+    dates = [date for date in dates if pd.notna(date)]
+    if not dates:
+        return None
+    return [min(dates).strftime("%Y-%m-%d"), max(dates).strftime("%Y-%m-%d")]
+
+
+def _summarize_dataset(dataset: pd.DataFrame) -> str:
+    """Describe the dataset's shape, column types and date range as JSON."""
+    summary = {
+        "shape": list(dataset.shape),
+        "dtypes": {str(col): str(dtype) for col, dtype in dataset.dtypes.items()},
+        "date_range": _date_range(dataset),
+    }
+    return orjson.dumps(summary, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _format_dataset_preview(dataset: pd.DataFrame) -> str:
+    """Render a bounded head/tail table of the dataset's values under its heading."""
+    if len(dataset) > 2 * PREVIEW_ROWS:
+        heading = f"Dataset Preview (first and last {PREVIEW_ROWS} rows):"
+        sample = pd.concat([dataset.head(PREVIEW_ROWS), dataset.tail(PREVIEW_ROWS)])
+    else:
+        heading = "Dataset Preview:"
+        sample = dataset
+    table = sample.to_string(max_cols=PREVIEW_COLS, max_colwidth=PREVIEW_COLWIDTH)
+    return f"{heading}\n{table}"
+
+
+# Static opening of every user prompt; kept ahead of the dataset and query so the
+# byte-identical prefix (system prompt + header) is reusable by automatic provider prompt caching
+PROMPT_HEADER = """Analyze this financial query using the provided dataset.
+Remember the instructions in the system prompt and provide a structured JSON response."""
+
+
 def generate_financial_prompt(task: Task, dataset: pd.DataFrame) -> str:
-    dataset_preview = f"Dataset Preview:\n{dataset.to_string()}"
-    return f"""Analyze this financial query using the provided dataset:
+    dataset_summary = f"Dataset Summary:\n{_summarize_dataset(dataset)}"
+    dataset_preview = _format_dataset_preview(dataset)
+    return f"""{PROMPT_HEADER}
+
+{dataset_summary}
 
 {dataset_preview}
 
 Query: "{task.description}"
-
-Remember the instructions in the system prompt and provide a structured JSON response.
 """
-
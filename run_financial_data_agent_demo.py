@@ -9,17 +9,17 @@ and formatted outputs. Run with: python -m demo.run_financial_data_agent_demo
 
 import asyncio
 import logging
+import sys
 from pathlib import Path
-from typing import Any, Dict, Type
+from typing import Any, Callable, Dict, Type
 
-import pandas as pd
 from dotenv import load_dotenv
 load_dotenv()
 
 from app.agents.schemas.financial_data_agent_schemas import FinancialDataAgentResponse
 from app.core.agents.constants import AgentType
 from app.core.mission.schemas.planner import Task
-from app.core.registry.agent_initializer import initialize_agents
+from app.core.registry.cached_initializer import close_components, get_components
 from app.core.schemas.base import BaseResponseModel
 from app.core.agents.types.agent_protocols import AgentProtocol
 
@@ -27,9 +27,62 @@ from app.core.agents.types.agent_protocols import AgentProtocol
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Streamed text is written out on newlines, every FLUSH_EVERY_CHUNKS chunks,
+# or FLUSH_INTERVAL seconds after it was buffered, even if the stream stalls
+FLUSH_EVERY_CHUNKS = 16
+FLUSH_INTERVAL = 0.02
+
+class _StreamWriter:
+    """Batch streamed text into a few stdout writes instead of one per chunk."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pending = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._encoding = sys.stdout.encoding or "utf-8"
+
+    def write(self, text: str) -> None:
+        """Buffer text, flushing at a batch boundary or once FLUSH_INTERVAL elapses."""
+        self._buffer += text.encode(self._encoding, errors="replace")
+        self._pending += 1
+        if "\n" in text or self._pending >= FLUSH_EVERY_CHUNKS:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(FLUSH_INTERVAL, self.flush)
+
+    def flush(self) -> None:
+        """Write buffered bytes straight to the binary stdout."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer:
+            sys.stdout.flush()  # Keep ordering with anything print() has buffered
+            sys.stdout.buffer.write(self._buffer)
+            sys.stdout.buffer.flush()
+            self._buffer.clear()
+        self._pending = 0
+
+def _on_stream_message(result: Dict[str, Any], writer: _StreamWriter) -> None:
+    """Write the text carried by a streamed chunk."""
+    message = result.get("message")
+    if message:
+        writer.write(message)
+
+def _on_stream_completed(result: Dict[str, Any], writer: _StreamWriter) -> None:
+    """Write the final chunk, or the execution time when it carries no text."""
+    if result.get("message"):
+        _on_stream_message(result, writer)
+    else:
+        writer.write(f"\nExecution time: {result.get('execution_time', 0):.2f}s\n")
+
+# Streamed chunk handlers keyed by chunk status; anything else is treated as text
+STREAM_HANDLERS: Dict[str | None, Callable[[Dict[str, Any], _StreamWriter], None]] = {
+    "completed": _on_stream_completed,
+}
+
 async def get_financial_agent() -> AgentProtocol:
     """Get a financial data agent with managed lifecycle."""
-    components = await initialize_agents()
+    components = await get_components()
     agent_registry = components[2]  # Assuming the registry is at index 2
     agent = agent_registry.get_agent(AgentType.FINANCIAL_ANALYST.value)
     if not agent:
@@ -44,15 +97,11 @@ async def run_demo() -> None:
     datasets_dir = Path("datasets")
     spreadsheet_path = datasets_dir / "neutroon_data.xlsx"
 
-    if not spreadsheet_path.exists():
-        raise FileNotFoundError(f"Spreadsheet not found at {spreadsheet_path}")
+    # Imported here so merely importing this module does not pull in pandas
+    from demo.dataset_loader import load_dataset
 
-    # Load dataset
-    dataset = pd.read_excel(spreadsheet_path)
-
-    # Drop columns with at least 80% null values
-    threshold = int(0.2 * len(dataset))  # At least 20% non-null values
-    dataset = dataset.dropna(axis=1, thresh=threshold)
+    # Load dataset (the loader raises FileNotFoundError and drops mostly-empty columns)
+    dataset = load_dataset(spreadsheet_path)
 
     # Prepare context variables
     context_variables = {
@@ -92,19 +141,25 @@ async def run_test_case(
     """Run a single test case."""
     # For streaming responses, show chunks in the same line
     if stream:
-        print("Response: ", end="", flush=True)
+        writer = _StreamWriter()
+        writer.write("Response: ")
         async for result in agent.execute(task, context_variables, stream=stream, response_format=response_format):
             if isinstance(result, dict):
-                if result.get("message"):
-                    print(result["message"], end="", flush=True)
-                elif result.get("status") == "completed":
-                    print(f"\nExecution time: {result.get('execution_time', 0):.2f}s")
-        print()  # New line at the end
+                STREAM_HANDLERS.get(result.get("status"), _on_stream_message)(result, writer)
+        writer.write("\n")  # New line at the end
+        writer.flush()
     else:
         # For non-streaming, show each result on a new line
         async for result in agent.execute(task, context_variables, stream=stream, response_format=response_format):
             print(f"Chunk: {result}")
 
+async def main() -> None:
+    """Run the demo, then close the shared agents before the event loop exits."""
+    try:
+        await run_demo()
+    finally:
+        await close_components()
+
 if __name__ == "__main__":
-    asyncio.run(run_demo())
+    asyncio.run(main())
 
@@ -1,10 +1,10 @@
 """Run spreadsheet demo to test agent functionality."""
 
 import asyncio
-import json
 import logging
 from pathlib import Path
 from typing import Any, Type, AsyncGenerator
+import orjson
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 
@@ -13,7 +13,7 @@ load_dotenv()
 from app.agents.external.spreadsheet_agent import SpreadsheetAgent
 from app.core.agents.constants import AgentType, ContentKey, StatusMessage
 from app.core.mission.schemas.planner import Task
-from app.core.registry.agent_initializer import initialize_agents
+from app.core.registry.cached_initializer import close_components, get_components
 from app.core.schemas.base import BaseResponseModel
 
 # Configure logging
@@ -32,7 +32,7 @@ def format_response(result: dict[str, Any]) -> str:
         try:
             message = result["message"]
             if isinstance(message, dict):
-                output.append(f"Message: {json.dumps(message, indent=2)}")
+                output.append(f"Message: {orjson.dumps(message, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()}")
             else:
                 output.append(f"Message: {message}")
         except Exception as e:
@@ -46,16 +46,13 @@ def format_response(result: dict[str, Any]) -> str:
 
 @asynccontextmanager
 async def get_spreadsheet_agent() -> AsyncGenerator[SpreadsheetAgent, None]:
-    """Get a spreadsheet agent with managed lifecycle."""
-    components = await initialize_agents()
+    """Get the shared spreadsheet agent; the cached registry owns its lifecycle, so it is not closed here."""
+    components = await get_components()
     agent_registry = components[2]
     agent = agent_registry.get_agent(AgentType.SPREADSHEET.value)
     if not agent:
         raise RuntimeError("Spreadsheet Agent not found in registry")
-    try:
-        yield agent
-    finally:
-        await agent.close()
+    yield agent
 
 async def run_spreadsheet_demo(stream: bool = False) -> None:
     """Run the spreadsheet agent demo."""
@@ -98,5 +95,12 @@ async def run_spreadsheet_demo(stream: bool = False) -> None:
         if agent and hasattr(agent, 'close'):
             await agent.close()
 
+async def main() -> None:
+    """Run the demo, then close the shared agents before the event loop exits."""
+    try:
+        await run_spreadsheet_demo()
+    finally:
+        await close_components()
+
 if __name__ == "__main__":
-    asyncio.run(run_spreadsheet_demo())
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -10,12 +10,9 @@ Run with: python -m demo.run_visualization_agent_demo
 import asyncio
 import logging
 from pathlib import Path
-from typing import Any, Dict, Type
-import json
+from typing import Any, Callable, Dict, Optional, Type
 
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+from pydantic import ValidationError
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -23,7 +20,7 @@ load_dotenv()
 from app.agents.schemas.visualization_agent_schemas import VisualizationAgentResponse
 from app.core.agents.constants import AgentType
 from app.core.mission.schemas.planner import Task
-from app.core.registry.agent_initializer import initialize_agents
+from app.core.registry.cached_initializer import close_components, get_components
 from app.core.schemas.base import BaseResponseModel
 from app.core.agents.types.agent_protocols import AgentProtocol
 
@@ -31,9 +28,28 @@ from app.core.agents.types.agent_protocols import AgentProtocol
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+def _on_completed(result: Dict[str, Any]) -> Optional[VisualizationAgentResponse]:
+    """Extract the chart specification from a completed chunk, if it holds one."""
+    message = result.get("message")
+    payload = result.get("result")
+    try:
+        if message:
+            # Parse and validate in a single pass
+            return VisualizationAgentResponse.model_validate_json(message)
+        if payload:
+            return VisualizationAgentResponse.model_validate(payload)
+    except ValidationError as e:
+        logger.error(f"Invalid visualization response: {e}")
+    return None
+
+# Result handlers keyed by chunk status; chunks with other statuses are skipped
+RESULT_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Optional[VisualizationAgentResponse]]] = {
+    "completed": _on_completed,
+}
+
 async def get_visualization_agent() -> AgentProtocol:
     """Get the visualization agent with managed lifecycle."""
-    components = await initialize_agents()
+    components = await get_components()
     agent_registry = components[2]
     agent = agent_registry.get_agent(AgentType.VISUALIZATION.value)
     if not agent:
@@ -48,13 +64,11 @@ async def run_demo() -> None:
     datasets_dir = Path("datasets")
     spreadsheet_path = datasets_dir / "neutroon_data.xlsx"
 
-    if not spreadsheet_path.exists():
-        raise FileNotFoundError(f"Spreadsheet not found at {spreadsheet_path}")
+    # Imported here so merely importing this module stays cheap
+    from demo.dataset_loader import load_dataset
 
-    dataset = pd.read_excel(spreadsheet_path)
-    # Drop columns with at least 80% null values
-    threshold = int(0.2 * len(dataset))
-    dataset = dataset.dropna(axis=1, thresh=threshold)
+    # Load dataset (the loader raises FileNotFoundError and drops mostly-empty columns)
+    dataset = load_dataset(spreadsheet_path)
 
     context_variables = {
         "dataset": dataset
@@ -88,39 +102,35 @@ async def run_demo() -> None:
     for r in results:
         # If the agent returns directly as a model instance
         if isinstance(r, VisualizationAgentResponse):
-            final_result = r.dict()
+            final_result = r
             break
         # If it returns as a dict with 'status' and 'message' or 'result'
         if isinstance(r, dict):
-            if r.get("status") == "completed" and r.get("message"):
-                try:
-                    final_result = json.loads(r["message"])
+            handler = RESULT_HANDLERS.get(r.get("status"))
+            if handler:
+                final_result = handler(r)
+                if final_result is not None:
                     break
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {e}")
-            elif r.get("status") == "completed" and r.get("result"):
-                final_result = r["result"]
-                break
 
     if final_result is None:
         print("No valid visualization specification returned from the agent.")
         return
 
-    # Validate the required fields
-    required_fields = ["chart_type", "title", "x_label", "y_label", "data_points"]
-    if not all(field in final_result for field in required_fields):
-        print(f"Invalid visualization specification. Missing required fields. Got: {final_result.keys()}")
-        return
-
-    chart_type = final_result["chart_type"]
-    title = final_result["title"]
-    x_label = final_result["x_label"]
-    y_label = final_result["y_label"]
-    data_points = final_result["data_points"]
+    # Required fields are guaranteed by schema validation, so read them straight off the model
+    chart_type = final_result.chart_type
+    title = final_result.title
+    x_label = final_result.x_label
+    y_label = final_result.y_label
+    data_points = final_result.data_points
 
     # Optional fields
-    notes = final_result.get("notes")
-    data_source = final_result.get("data_source")
+    notes = final_result.notes
+    data_source = final_result.data_source
+
+    # Plotting libraries are slow to import, so load them only once there is a chart to draw
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    import seaborn as sns
 
     # Convert data_points into a DataFrame for plotting
     df = pd.DataFrame(data_points)
@@ -151,5 +161,12 @@ async def run_demo() -> None:
     # Show the plot
     plt.show()
 
+async def main() -> None:
+    """Run the demo, then close the shared agents before the event loop exits."""
+    try:
+        await run_demo()
+    finally:
+        await close_components()
+
 if __name__ == "__main__":
-    asyncio.run(run_demo())
+    asyncio.run(main())
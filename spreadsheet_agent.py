@@ -1,20 +1,62 @@
 # app/agents/spreadsheet_agent.py
 
+import asyncio
+import itertools
 import logging
 from pathlib import Path
 from typing import Any, Dict, List, Tuple, ClassVar, AsyncGenerator
+import orjson
 import pandas as pd
-import yaml
 
 from app.agents.base.agent import Agent
 from app.core.agents.constants import AgentType, AgentDescription, AgentIcon, StatusMessage
 from app.core.mission.schemas.planner import Task
 from app.core.schemas.base import BaseResponseModel
-from app.agents.schemas.spreadsheet_agent_schemas import SpreadsheetProcessingResponse, SheetInfo
+from app.agents.schemas.spreadsheet_agent_schemas import SpreadsheetProcessingResponse, SheetInfo, SHEETS_METADATA_ADAPTER
 from app.agents.prompts.spreadsheet_agent_prompts import SYSTEM_PROMPT, PROCESSING_PROMPT
+from app.core.date_formats import KNOWN_DATE_FORMATS, match_header_format
+from app.core.excel_engine import EXCEL_ENGINE
 
 logger = logging.getLogger(__name__)
 
+# The only known format an all-digit value can satisfy, tried against integer columns
+INTEGER_DATE_FORMATS = ("%Y%m",)
+
+# Format recorded for timestamp columns whose values fit none of the known formats
+TIMESTAMP_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Non-null values sampled from a column when checking whether it holds dates
+DATE_SAMPLE_SIZE = 10
+
+# dtype kinds treated as numeric; booleans are excluded, as is_numeric_dtype does for Arrow bools
+INTEGER_KINDS = frozenset("iu")
+NUMERIC_KINDS = frozenset("iufc")
+
+# Reported data type by dtype kind (numpy and Arrow dtypes alike); anything else is a string
+DTYPE_KIND_TYPES = {
+    "M": "datetime",
+    "i": "integer",
+    "u": "integer",
+    "f": "float",
+    "b": "boolean",
+}
+
+
+def _sample_non_null(series: pd.Series, size: int = DATE_SAMPLE_SIZE) -> pd.Series:
+    """Return the first non-null values of a column as strings without copying the whole column."""
+    # Leading nulls are rare, so a short window of rows usually holds enough values
+    window = size * 4
+    sample = series.iloc[:window].dropna()
+    if len(sample) < size and len(series) > window:
+        sample = series.dropna()
+    sample = sample.head(size)
+    if sample.dtype.kind == "M":
+        # Arrow timestamps stringify in ISO "T" form; rebuild as numpy-backed values so they
+        # render as "2024-01-01" or "2024-01-01 10:05:00", which the known formats match
+        sample = pd.Series(sample.tolist(), index=sample.index)
+    return sample.astype(str)
+
+
 class SpreadsheetAgent(Agent):
     """Agent for processing spreadsheet data."""
 
@@ -70,24 +112,50 @@ class SpreadsheetAgent(Agent):
             if not path.exists():
                 raise FileNotFoundError(f"Spreadsheet not found at {spreadsheet_path}")
             
-            # Load all sheets
-            sheets = pd.read_excel(spreadsheet_path, sheet_name=None)
-            
             # Extract metadata
             sheets_metadata = {}
             global_date_formats = set()
             metrics_mapping = {}
-            for sheet_name, df in sheets.items():
-                self.logger.info(f"Processing sheet: {sheet_name}")
-                
-                # Clean column names
-                df.columns = df.columns.astype(str).str.strip()
+            # Parse sheets one at a time; the reader is not thread-safe, but each sheet's
+            # CPU-bound metadata extraction runs in the default executor while the next one parses.
+            # Only one extraction is in flight, so at most two sheet frames are held at once.
+            loop = asyncio.get_running_loop()
+            results = {}
+            in_flight = None  # (sheet name, extraction future) not yet awaited
+            try:
+                with pd.ExcelFile(spreadsheet_path, engine=EXCEL_ENGINE) as workbook:
+                    for sheet_name in workbook.sheet_names:
+                        self.logger.info(f"Processing sheet: {sheet_name}")
+                        # Keep pandas' parser rather than building frames from raw calamine rows: its
+                        # header mangling, NA strings ("N/A", "NULL", ...) and numeric inference define
+                        # the columns, null counts and types reported below
+                        df = workbook.parse(sheet_name, dtype_backend="pyarrow")
+                        
+                        # Clean column names and filter out unnamed columns in one pass
+                        columns = df.columns.astype(str).str.strip()
+                        keep = ~columns.str.startswith('Unnamed')
+                        df = df.loc[:, keep]
+                        df.columns = columns[keep]
+                        
+                        # Finish the previous sheet before handing this one to the executor
+                        if in_flight is not None:
+                            previous_name, previous_future = in_flight
+                            in_flight = None
+                            results[previous_name] = await previous_future
+                        
+                        # Extract sheet metadata
+                        in_flight = (sheet_name, loop.run_in_executor(None, self._extract_sheet_metadata, df, sheet_name))
                 
-                # Filter out unnamed columns
-                df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
-                
-                # Extract sheet metadata
-                sheet_info, metrics_in_sheet = await self._extract_sheet_metadata(df, sheet_name)
+                if in_flight is not None:
+                    last_name, last_future = in_flight
+                    in_flight = None
+                    results[last_name] = await last_future
+            finally:
+                # On failure, don't leave the submitted extraction behind unawaited
+                if in_flight is not None:
+                    in_flight[1].cancel()
+            
+            for sheet_name, (sheet_info, metrics_in_sheet) in results.items():
                 sheets_metadata[sheet_name] = sheet_info
                 
                 # Collect date formats from all sheets
@@ -96,7 +164,7 @@ class SpreadsheetAgent(Agent):
                 # Collect metrics mapping
                 if metrics_in_sheet:
                     metrics_mapping[sheet_name] = metrics_in_sheet
-                
+            
             # Generate global settings
             global_settings = {
                 'date_formats': list(global_date_formats)
@@ -106,16 +174,13 @@ class SpreadsheetAgent(Agent):
             config_data = {
                 'version': '1.0',
                 'global': global_settings,
-                'sheets': {
-                    sheet_name: sheet_info.model_dump(exclude_unset=True) for sheet_name, sheet_info in sheets_metadata.items()
-                },
+                'sheets': SHEETS_METADATA_ADAPTER.dump_python(sheets_metadata, exclude_unset=True),
                 'metrics_mapping': metrics_mapping  # Added metrics mapping
             }
             
             # Save the metadata to a config file
-            config_path = path.with_suffix('.yaml')
-            with open(config_path, 'w') as f:
-                yaml.dump(config_data, f, sort_keys=False)
+            config_path = path.with_suffix('.json')
+            config_path.write_bytes(orjson.dumps(config_data, option=orjson.OPT_INDENT_2))
             
             self.logger.info(f"Config file saved at: {config_path}")
             
@@ -130,30 +195,35 @@ class SpreadsheetAgent(Agent):
             self.logger.error(f"Error in SpreadsheetAgent: {str(e)}")
             raise
     
-    async def _extract_sheet_metadata(self, df: pd.DataFrame, sheet_name: str) -> Tuple[SheetInfo, Dict[str, str]]:
-        """Extract metadata from a single sheet."""
+    def _extract_sheet_metadata(self, df: pd.DataFrame, sheet_name: str) -> Tuple[SheetInfo, Dict[str, str]]:
+        """Extract metadata from a single sheet (pure CPU work, safe to run in a worker thread)."""
         # Columns
         columns = df.columns.tolist()
         
+        # dtype kind per column, shared by the type checks below
+        dtype_kinds = df.dtypes.map(lambda dtype: dtype.kind)
+        
         # Date columns and formats
-        date_columns, date_formats = self._detect_date_columns(df)
+        date_columns, date_formats = self._detect_date_columns(df, dtype_kinds)
         
         # Update data types based on date detection
-        data_types = self._infer_data_types(df, date_columns)
+        data_types = self._infer_data_types(dtype_kinds, date_columns)
         
         # Null counts
-        null_counts = df.isnull().sum().to_dict()
-        null_counts = {str(k): int(v) for k, v in null_counts.items()}
+        null_counts = df.isnull().sum().astype(int).to_dict()
         
         # Detect if the sheet has headers
         has_headers = True  # Assuming headers are present
         
+        # Per-column statistics shared by the column classifiers
+        stats = self._compute_column_stats(df, dtype_kinds)
+        
         # Identify possible identifier and description columns
-        identifier_columns = self._identify_identifier_columns(df)
-        description_columns = self._identify_description_columns(df, identifier_columns)
+        identifier_columns = self._identify_identifier_columns(stats)
+        description_columns = self._identify_description_columns(stats, identifier_columns)
         
         # Identify possible metric columns
-        metric_columns = self._identify_metric_columns(df, identifier_columns + description_columns + date_columns)
+        metric_columns = self._identify_metric_columns(stats, identifier_columns + description_columns + date_columns)
         
         # Extract metrics mapping
         metrics_mapping = self._extract_metrics(df, identifier_columns, description_columns)
@@ -176,108 +246,89 @@ class SpreadsheetAgent(Agent):
         
         return sheet_info, metrics_mapping
     
-    def _detect_date_columns(self, df: pd.DataFrame) -> Tuple[List[str], List[str]]:
+    def _detect_date_columns(self, df: pd.DataFrame, dtype_kinds: pd.Series) -> Tuple[List[str], List[str]]:
         """Identify columns that contain date values and collect date formats."""
-        date_columns = []
+        date_columns = {}  # dict keeps detection order while de-duplicating
         date_formats = set()
-        known_formats = [
-            "%d/%m/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%B %Y", "%b-%y",
-            "%m/%Y", "%Y%m", "%d-%m-%Y", "%m-%d-%Y", "%b-%y", "%b-%Y",
-            "%Y-%b", "%b/%y", "%b/%Y"
-        ]
 
-        for col in df.columns:
-            # Try to parse the column name as a date
-            for fmt in known_formats:
-                try:
-                    pd.to_datetime(col, format=fmt, errors='raise')
-                    date_columns.append(col)
-                    date_formats.add(fmt)
-                    self.logger.debug(f"Column '{col}' matched date format '{fmt}'")
-                    break
-                except (ValueError, TypeError):
-                    continue
+        for col, kind in dtype_kinds.items():
+            # Try to parse the column name as a date; headers repeat across sheets, so this is memoized
+            fmt = match_header_format(col)
+            if fmt:
+                date_columns[col] = None
+                date_formats.add(fmt)
+                self.logger.debug(f"Column '{col}' matched date format '{fmt}'")
 
             if col.lower() in ['date', 'year', 'month']:
-                date_columns.append(col)
+                date_columns[col] = None
                 self.logger.debug(f"Column '{col}' identified as a date-related column based on name")
                 continue
+
+            # Float and boolean values cannot be date strings; integers can only be YYYYMM
+            if kind in INTEGER_KINDS:
+                candidate_formats = INTEGER_DATE_FORMATS
+            elif kind in NUMERIC_KINDS or kind == "b":
+                continue
             else:
-                # Try to parse strings in the column as dates
-                sample_data = df[col].dropna().astype(str).head(10)
-                for fmt in known_formats:
-                    try:
-                        pd.to_datetime(sample_data, format=fmt, errors='raise')
-                        date_columns.append(col)
-                        date_formats.add(fmt)
-                        self.logger.debug(f"Column '{col}' data matched date format '{fmt}'")
-                        break
-                    except (ValueError, TypeError):
-                        continue
+                candidate_formats = KNOWN_DATE_FORMATS
 
-        # Remove duplicates
-        date_columns = list(set(date_columns))
-        return date_columns, list(date_formats)
-    
-    def _infer_data_types(self, df: pd.DataFrame, date_columns: List[str]) -> Dict[str, str]:
-        """Infer data types for each column, converting date columns."""
-        inferred_types = {}
-        for col in df.columns:
-            if col in date_columns:
-                # Attempt to convert column to datetime
-                try:
-                    df[col] = pd.to_datetime(df[col], errors='coerce', dayfirst=True)
-                    inferred_types[col] = "datetime"
-                    self.logger.debug(f"Column '{col}' converted to datetime")
-                except Exception as e:
-                    self.logger.warning(f"Failed to convert column '{col}' to datetime: {e}")
-                    inferred_types[col] = "string"
+            # Try to parse strings in the column as dates
+            sample_data = _sample_non_null(df[col])
+            if sample_data.empty:
+                continue
+            for fmt in candidate_formats:
+                if pd.to_datetime(sample_data, format=fmt, errors='coerce').notna().all():
+                    date_columns[col] = None
+                    date_formats.add(fmt)
+                    self.logger.debug(f"Column '{col}' data matched date format '{fmt}'")
+                    break
             else:
-                series = df[col]
-                if pd.api.types.is_datetime64_any_dtype(series):
-                    inferred_types[col] = "datetime"
-                elif pd.api.types.is_integer_dtype(series):
-                    inferred_types[col] = "integer"
-                elif pd.api.types.is_float_dtype(series):
-                    inferred_types[col] = "float"
-                elif pd.api.types.is_bool_dtype(series):
-                    inferred_types[col] = "boolean"
-                else:
-                    inferred_types[col] = "string"
+                if kind == "M":
+                    # Timestamp cells are dates even when their rendering (e.g. sub-second times) fits no known format
+                    date_columns[col] = None
+                    date_formats.add(TIMESTAMP_DATE_FORMAT)
+                    self.logger.debug(f"Column '{col}' holds timestamps; recorded as '{TIMESTAMP_DATE_FORMAT}'")
+
+        return list(date_columns), list(date_formats)
+    
+    def _infer_data_types(self, dtype_kinds: pd.Series, date_columns: List[str]) -> Dict[str, str]:
+        """Infer data types for each column, reporting detected date columns as datetimes."""
+        inferred_types = {col: DTYPE_KIND_TYPES.get(kind, "string") for col, kind in dtype_kinds.items()}
+        inferred_types.update(dict.fromkeys(date_columns, "datetime"))
         return inferred_types
     
-    def _identify_identifier_columns(self, df: pd.DataFrame) -> List[str]:
-        """Identify possible identifier columns based on data patterns."""
-        identifier_columns = []
+    def _compute_column_stats(self, df: pd.DataFrame, dtype_kinds: pd.Series) -> pd.DataFrame:
+        """Compute the per-column statistics used to classify columns in one sweep."""
         total_rows = len(df)
-        for col in df.columns:
-            unique_values = df[col].dropna().unique()
-            uniqueness_ratio = len(unique_values) / total_rows if total_rows > 0 else 0
-            non_null_ratio = df[col].notnull().mean()
-            # Include columns regardless of data type
-            if non_null_ratio > 0.4 and uniqueness_ratio < 0.9:
-                identifier_columns.append(col)
-                self.logger.debug(f"Column '{col}' identified as an identifier column (Uniqueness: {uniqueness_ratio:.2f})")
+        return pd.DataFrame({
+            'non_null_ratio': df.notna().sum() / total_rows if total_rows > 0 else 0.0,
+            'uniqueness_ratio': df.nunique(dropna=True) / total_rows if total_rows > 0 else 0.0,
+            'numeric': dtype_kinds.isin(NUMERIC_KINDS),
+        }, index=df.columns)
+    
+    def _identify_identifier_columns(self, stats: pd.DataFrame) -> List[str]:
+        """Identify possible identifier columns based on data patterns."""
+        # Include columns regardless of data type
+        is_identifier = (stats['non_null_ratio'] > 0.4) & (stats['uniqueness_ratio'] < 0.9)
+        identifier_columns = stats.index[is_identifier].tolist()
+        for col in identifier_columns:
+            self.logger.debug(f"Column '{col}' identified as an identifier column (Uniqueness: {stats.at[col, 'uniqueness_ratio']:.2f})")
         return identifier_columns
     
-    def _identify_description_columns(self, df: pd.DataFrame, exclude_columns: List[str]) -> List[str]:
+    def _identify_description_columns(self, stats: pd.DataFrame, exclude_columns: List[str]) -> List[str]:
         """Identify possible description columns."""
-        description_columns = []
-        for col in df.columns:
-            if col not in exclude_columns:
-                non_null_ratio = df[col].notnull().mean()
-                if non_null_ratio > 0.4:
-                    description_columns.append(col)
-                    self.logger.debug(f"Column '{col}' identified as a description column")
+        is_description = ~stats.index.isin(exclude_columns) & (stats['non_null_ratio'] > 0.4)
+        description_columns = stats.index[is_description].tolist()
+        for col in description_columns:
+            self.logger.debug(f"Column '{col}' identified as a description column")
         return description_columns
     
-    def _identify_metric_columns(self, df: pd.DataFrame, exclude_columns: List[str]) -> List[str]:
+    def _identify_metric_columns(self, stats: pd.DataFrame, exclude_columns: List[str]) -> List[str]:
         """Identify possible metric columns based on data types."""
-        metric_columns = []
-        for col in df.columns:
-            if col not in exclude_columns and pd.api.types.is_numeric_dtype(df[col]):
-                metric_columns.append(col)
-                self.logger.debug(f"Column '{col}' identified as a metric column")
+        is_metric = ~stats.index.isin(exclude_columns) & stats['numeric']
+        metric_columns = stats.index[is_metric].tolist()
+        for col in metric_columns:
+            self.logger.debug(f"Column '{col}' identified as a metric column")
         return metric_columns
     
     def _extract_metrics(self, df: pd.DataFrame, identifier_columns: List[str], description_columns: List[str]) -> Dict[str, str]:
@@ -288,31 +339,34 @@ class SpreadsheetAgent(Agent):
             Dict[str, str]: Mapping of metric identifiers to descriptions.
         """
         metrics = {}
-        columns_to_try = []
-        # First, try the first column as identifier and second as description
-        if df.columns.size >= 2:
-            columns_to_try.append((df.columns[0], df.columns[1]))
-            self.logger.debug(f"Trying to map metrics using columns: '{df.columns[0]}' (ID) and '{df.columns[1]}' (Description)")
-        # Then, try identified identifier and description columns
-        for id_col in identifier_columns:
-            for desc_col in description_columns:
-                columns_to_try.append((id_col, desc_col))
-                self.logger.debug(f"Trying to map metrics using columns: '{id_col}' (ID) and '{desc_col}' (Description)")
+        # First, try the first column as identifier and second as description,
+        # then every pairing of the identified identifier and description columns
+        leading_pair = [(df.columns[0], df.columns[1])] if df.columns.size >= 2 else []
+        columns_to_try = itertools.chain(leading_pair, itertools.product(identifier_columns, description_columns))
+        
+        # Cleaned values and usable-row mask per column, built the first time a pair needs them
+        cleaned: Dict[str, Tuple[pd.Series, Any]] = {}
 
         for id_col, desc_col in columns_to_try:
-            id_series = df[id_col].astype(str)
-            desc_series = df[desc_col].astype(str)
-            combined_non_null = id_series.notnull() & desc_series.notnull()
-            if combined_non_null.sum() == 0:
+            self.logger.debug(f"Trying to map metrics using columns: '{id_col}' (ID) and '{desc_col}' (Description)")
+            for col in (id_col, desc_col):
+                if col not in cleaned:
+                    cleaned[col] = self._clean_metric_column(df[col])
+            ids, id_usable = cleaned[id_col]
+            descs, desc_usable = cleaned[desc_col]
+            valid = id_usable & desc_usable
+            if not valid.any():
                 self.logger.debug(f"No overlapping data found between '{id_col}' and '{desc_col}'")
                 continue  # No overlapping data
             # Create mapping
-            for identifier, description in zip(id_series[combined_non_null], desc_series[combined_non_null]):
-                identifier = str(identifier).strip()
-                description = str(description).strip()
-                if identifier and description and identifier.lower() != 'nan' and description.lower() != 'nan':
-                    metrics[identifier] = description
-            if metrics:
-                self.logger.debug(f"Metrics mapping found using columns '{id_col}' and '{desc_col}': {metrics}")
-                return metrics  # Return on first successful mapping
+            metrics = dict(zip(ids[valid].tolist(), descs[valid].tolist()))
+            self.logger.debug(f"Metrics mapping found using columns '{id_col}' and '{desc_col}': {metrics}")
+            return metrics  # Return on first successful mapping
         return metrics
+    
+    def _clean_metric_column(self, series: pd.Series) -> Tuple[pd.Series, Any]:
+        """Strip a column's values as strings and mask the rows usable in a metrics mapping."""
+        # Arrow-backed strings keep strip/lower/compare in native kernels and nulls stay null
+        values = series.astype("string[pyarrow]").str.strip()
+        usable = values.notna() & (values != '') & (values.str.lower() != 'nan')
+        return values, usable.to_numpy(dtype=bool)
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class SheetInfo(BaseModel):
@@ -22,6 +22,9 @@ class SheetInfo(BaseModel):
             float: str
         }
 
+# Serializes a whole workbook's sheet metadata in a single pydantic-core call
+SHEETS_METADATA_ADAPTER = TypeAdapter(Dict[str, SheetInfo])
+
 class SpreadsheetProcessingResponse(BaseModel):
     sheets_metadata: Dict[str, SheetInfo]
     processed_data: Dict[str, Any]
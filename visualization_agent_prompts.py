@@ -31,8 +31,18 @@ Requirements:
 Ensure the labels and text are human-friendly and aesthetically pleasing.
 """
 
+# Bounds on the dataset preview sent to the model
+PREVIEW_ROWS = 50
+PREVIEW_COLS = 20
+PREVIEW_COLWIDTH = 40
+
 def generate_visualization_prompt(task: Task, dataset: pd.DataFrame) -> str:
-    dataset_preview = f"Dataset Preview:\n{dataset.to_string()}"
+    preview = dataset.head(PREVIEW_ROWS).to_string(
+        max_rows=PREVIEW_ROWS, max_cols=PREVIEW_COLS, max_colwidth=PREVIEW_COLWIDTH
+    )
+    if len(dataset) > PREVIEW_ROWS:
+        preview += f"\n[showing {PREVIEW_ROWS} of {len(dataset)} rows]"
+    dataset_preview = f"Dataset Preview:\n{preview}"
     return f"""Analyze the following dataset and query:
 
 {dataset_preview}